@@ -20,12 +20,19 @@ cdef extern from "math.h":
     double sin(double x)
     double cos(double x)
     double sqrt(double x)
+    double floor(double x)
+    double ceil(double x)
 
 from cpython cimport bool
 
 DTYPE = np.float64
 ctypedef np.float64_t DTYPE_t
 
+# Output types supported by elliptical_overlap_grid
+ctypedef fused FRAC_t:
+    np.float32_t
+    np.float64_t
+
 cimport cython
 
 # NOTE: Here we need to make sure we use cimport to import the C functions from
@@ -36,10 +43,10 @@ from .core cimport distance, area_triangle, overlap_area_triangle_unit_circle
 
 def elliptical_overlap_grid(double xmin, double xmax, double ymin, double ymax,
                             int nx, int ny, double rx, double ry, double theta,
-                            int use_exact, int subpixels):
+                            int use_exact, int subpixels, dtype=DTYPE):
     """
     elliptical_overlap_grid(xmin, xmax, ymin, ymax, nx, ny, rx, ry,
-                             use_exact, subpixels)
+                             use_exact, subpixels, dtype=numpy.float64)
 
     Area of overlap between an ellipse and a pixel grid. The ellipse is
     centered on the origin.
@@ -63,6 +70,9 @@ def elliptical_overlap_grid(double xmin, double xmax, double ymin, double ymax,
         If ``use_exact`` is 0, each pixel is resampled by this factor in each
         dimension. Thus, each pixel is divided into ``subpixels ** 2``
         subpixels.
+    dtype : {`numpy.float64`, `numpy.float32`}, optional
+        The data type of the output array. The overlap is always computed
+        in double precision.
 
     Returns
     -------
@@ -70,14 +80,52 @@ def elliptical_overlap_grid(double xmin, double xmax, double ymin, double ymax,
         2-d array giving the fraction of the overlap.
     """
 
+    # Define output array
+    frac = np.zeros([ny, nx], dtype=dtype)
+
+    if frac.dtype == np.float64:
+        _elliptical_overlap_grid[np.float64_t](
+            frac, xmin, xmax, ymin, ymax, nx, ny, rx, ry, theta,
+            use_exact, subpixels)
+    elif frac.dtype == np.float32:
+        _elliptical_overlap_grid[np.float32_t](
+            frac, xmin, xmax, ymin, ymax, nx, ny, rx, ry, theta,
+            use_exact, subpixels)
+    else:
+        raise ValueError('dtype should be float32 or float64, '
+                         'got {}'.format(frac.dtype))
+
+    return frac
+
+
+# NOTE: The following functions use cdef because they are not
+# intended to be called from the Python code. Using def makes them
+# callable from outside, but also slower. In any case, these aren't useful
+# to call from outside because they only operate on a single pixel
+# or fill a pre-allocated array.
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _elliptical_overlap_grid(FRAC_t[:, :] frac,
+                                   double xmin, double xmax,
+                                   double ymin, double ymax,
+                                   int nx, int ny, double rx, double ry,
+                                   double theta, int use_exact,
+                                   int subpixels):
+    """
+    Fill ``frac`` with the area of overlap between an ellipse and a pixel
+    grid. See `elliptical_overlap_grid` for a description of the
+    parameters.
+    """
+
     cdef unsigned int i, j
     cdef double x, y, dx, dy
     cdef double bxmin, bxmax, bymin, bymax
     cdef double pxmin, pxmax, pymin, pymax
     cdef double norm
-
-    # Define output array
-    cdef np.ndarray[DTYPE_t, ndim=2] frac = np.zeros([ny, nx], dtype=DTYPE)
+    cdef double cos_theta, sin_theta, inv_rx_sq, inv_ry_sq
+    cdef double pxcen, pycen, outer_sq
 
     # Find the width of each element in x and y
     dx = (xmax - xmin) / nx
@@ -85,6 +133,13 @@ def elliptical_overlap_grid(double xmin, double xmax, double ymin, double ymax,
 
     norm = 1. / (dx * dy)
 
+    # Quantities that only depend on the ellipse are computed once here
+    # rather than for every pixel
+    cos_theta = cos(theta)
+    sin_theta = sin(theta)
+    inv_rx_sq = 1. / (rx * rx)
+    inv_ry_sq = 1. / (ry * ry)
+
     # For now we use a bounding circle and then use that to find a bounding box
     # but of course this is inefficient and could be done better.
 
@@ -97,67 +152,130 @@ def elliptical_overlap_grid(double xmin, double xmax, double ymin, double ymax,
     bymin = -r - 0.5 * dy
     bymax = +r + 0.5 * dy
 
+    # A pixel lies within a circle of radius ``pixel_radius`` around its
+    # center, and that circle lies within the ellipse scaled by
+    # ``pixel_radius / min(rx, ry)``. A pixel whose center is outside the
+    # ellipse scaled by one plus this factor is therefore fully outside the
+    # ellipse. We store the square of the scaled radius.
+    outer_sq = 1. + 0.5 * sqrt(dx * dx + dy * dy) / min(rx, ry)
+    outer_sq *= outer_sq
+
     for i in range(nx):
         pxmin = xmin + i * dx  # lower end of pixel
+        pxcen = pxmin + dx * 0.5
         pxmax = pxmin + dx  # upper end of pixel
         if pxmax > bxmin and pxmin < bxmax:
             for j in range(ny):
                 pymin = ymin + j * dy
+                pycen = pymin + dy * 0.5
                 pymax = pymin + dy
                 if pymax > bymin and pymin < bymax:
-                    if use_exact:
+
+                    # If the pixel is well outside the ellipse, there is
+                    # no overlap. No action needed.
+                    if ellipse_radius_sq(pxcen, pycen, cos_theta, sin_theta,
+                                         inv_rx_sq, inv_ry_sq) > outer_sq:
+                        continue
+
+                    # Since the ellipse is convex, if all four corners of
+                    # the pixel are inside the ellipse, count full pixel.
+                    if (ellipse_radius_sq(pxmin, pymin, cos_theta, sin_theta,
+                                          inv_rx_sq, inv_ry_sq) < 1. and
+                            ellipse_radius_sq(pxmax, pymin, cos_theta, sin_theta,
+                                              inv_rx_sq, inv_ry_sq) < 1. and
+                            ellipse_radius_sq(pxmin, pymax, cos_theta, sin_theta,
+                                              inv_rx_sq, inv_ry_sq) < 1. and
+                            ellipse_radius_sq(pxmax, pymax, cos_theta, sin_theta,
+                                              inv_rx_sq, inv_ry_sq) < 1.):
+                        frac[j, i] = 1.
+
+                    # Otherwise, the pixel is close to the ellipse border, so
+                    # either do exact calculation or use subpixel sampling.
+                    elif use_exact:
                         frac[j, i] = elliptical_overlap_single_exact(
                             pxmin, pymin, pxmax, pymax, rx, ry, theta) * norm
                     else:
                         frac[j, i] = elliptical_overlap_single_subpixel(
-                            pxmin, pymin, pxmax, pymax, rx, ry, theta,
-                            subpixels)
-    return frac
+                            pxmin, pymin, pxmax, pymax, cos_theta, sin_theta,
+                            inv_rx_sq, inv_ry_sq, subpixels)
 
 
-# NOTE: The following two functions use cdef because they are not
-# intended to be called from the Python code. Using def makes them
-# callable from outside, but also slower. In any case, these aren't useful
-# to call from outside because they only operate on a single pixel.
+cdef inline double ellipse_radius_sq(double x, double y, double cos_theta,
+                                     double sin_theta, double inv_rx_sq,
+                                     double inv_ry_sq):
+    """
+    Return the squared normalized radius of the point (x, y) with respect to
+    an ellipse centered on the origin, which is less than one for points
+    inside the ellipse.
+    """
+
+    cdef double x_tr, y_tr
+
+    # Transform into frame of rotated ellipse
+    x_tr = y * sin_theta + x * cos_theta
+    y_tr = y * cos_theta - x * sin_theta
+
+    return x_tr * x_tr * inv_rx_sq + y_tr * y_tr * inv_ry_sq
 
 
 cdef double elliptical_overlap_single_subpixel(double x0, double y0,
                                                double x1, double y1,
-                                               double rx, double ry,
-                                               double theta, int subpixels):
+                                               double cos_theta,
+                                               double sin_theta,
+                                               double inv_rx_sq,
+                                               double inv_ry_sq,
+                                               int subpixels):
     """
     Return the fraction of overlap between a ellipse and a single pixel with
-    given extent, using a sub-pixel sampling method.
+    given extent, using a sub-pixel sampling method. The ellipse is given by
+    the cosine and sine of its rotation angle and the inverse squares of its
+    semi-axes.
     """
 
-    cdef unsigned int i, j
-    cdef double x, y
+    cdef unsigned int i
+    cdef double x
     cdef double frac = 0.  # Accumulator.
-    cdef double inv_rx_sq, inv_ry_sq
-    cdef double cos_theta = cos(theta)
-    cdef double sin_theta = sin(theta)
     cdef double dx, dy
-    cdef double x_tr, y_tr
+    cdef double x_cos, x_sin
+    cdef double a, inv_a, half_b, c, disc
+    cdef double inv_dy, jmin, jmax, jcen, jhalf
 
     dx = (x1 - x0) / subpixels
     dy = (y1 - y0) / subpixels
+    inv_dy = 1. / dy
 
-    inv_rx_sq = 1. / (rx * rx)
-    inv_ry_sq = 1. / (ry * ry)
+    # Along a column of subpixels at fixed x, the squared normalized radius
+    # is a quadratic a * y ** 2 + 2 * half_b * y + c in y. Rather than
+    # testing every subpixel, we find the range of y inside the ellipse and
+    # count the subpixel centers y0 + (j + 0.5) * dy that fall in it.
+    a = sin_theta * sin_theta * inv_rx_sq + cos_theta * cos_theta * inv_ry_sq
+    inv_a = 1. / a
 
     x = x0 - 0.5 * dx
     for i in range(subpixels):
         x += dx
-        y = y0 - 0.5 * dy
-        for j in range(subpixels):
-            y += dy
-
-            # Transform into frame of rotated ellipse
-            x_tr = y * sin_theta + x * cos_theta
-            y_tr = y * cos_theta - x * sin_theta
-
-            if x_tr * x_tr * inv_rx_sq + y_tr * y_tr * inv_ry_sq < 1.:
-                frac += 1.
+        x_cos = x * cos_theta
+        x_sin = x * sin_theta
+
+        half_b = x_cos * sin_theta * inv_rx_sq - x_sin * cos_theta * inv_ry_sq
+        c = x_cos * x_cos * inv_rx_sq + x_sin * x_sin * inv_ry_sq
+
+        disc = half_b * half_b - a * (c - 1.)
+        if disc <= 0.:
+            continue
+
+        # Range of subpixel indices strictly inside the ellipse, given by
+        # the (fractional) index of the center of the chord and its half
+        # length in units of subpixels
+        jcen = (-half_b * inv_a - y0) * inv_dy - 0.5
+        jhalf = sqrt(disc) * inv_a * inv_dy
+        jmin = floor(jcen - jhalf) + 1.
+        jmax = ceil(jcen + jhalf) - 1.
+        jmin = max(jmin, 0.)
+        jmax = min(jmax, subpixels - 1.)
+
+        if jmax >= jmin:
+            frac += jmax - jmin + 1.
 
     return frac / (subpixels * subpixels)
 
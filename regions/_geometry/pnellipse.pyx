@@ -0,0 +1,139 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+# cython: language_level=3
+"""
+The functions defined here allow one to determine whether points are inside
+one or more ellipses.
+"""
+import numpy as np
+cimport numpy as np
+
+cimport cython
+
+
+__all__ = ['points_in_ellipse', 'points_in_ellipses']
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def points_in_ellipse(double[::1] x, double[::1] y, double cx, double cy,
+                      double cos_theta, double sin_theta,
+                      double inv_w2, double inv_h2, bint invert):
+    """
+    points_in_ellipse(x, y, cx, cy, cos_theta, sin_theta, inv_w2, inv_h2,
+                      invert)
+
+    Determine whether points are inside an ellipse.
+
+    The test is done in a single pass over the points, without creating
+    any temporary arrays.
+
+    Parameters
+    ----------
+    x, y : `~numpy.ndarray`
+        1-d contiguous arrays of the coordinates of the points.
+    cx, cy : float
+        The center of the ellipse.
+    cos_theta, sin_theta : float
+        The cosine and sine of the rotation angle of the ellipse.
+    inv_w2, inv_h2 : float
+        The inverse squares of the semi-axes of the ellipse.
+    invert : bool
+        If `True`, return whether the points are outside the ellipse
+        instead.
+
+    Returns
+    -------
+    result : `~numpy.ndarray`
+        1-d boolean array.
+    """
+
+    cdef Py_ssize_t i, n
+    cdef double dx, dy, x_tr, y_tr, rad
+
+    n = x.shape[0]
+
+    result = np.empty(n, dtype=bool)
+    cdef np.uint8_t[::1] res = result.view(np.uint8)
+
+    with nogil:
+        for i in range(n):
+            dx = x[i] - cx
+            dy = y[i] - cy
+
+            # Transform into frame of rotated ellipse
+            x_tr = cos_theta * dx + sin_theta * dy
+            y_tr = sin_theta * dx - cos_theta * dy
+
+            rad = x_tr * x_tr * inv_w2 + y_tr * y_tr * inv_h2
+            res[i] = (rad > 1.) if invert else (rad <= 1.)
+
+    return result
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def points_in_ellipses(double[::1] x, double[::1] y, double[::1] cx,
+                       double[::1] cy, double[::1] cos_theta,
+                       double[::1] sin_theta, double[::1] inv_w2,
+                       double[::1] inv_h2, np.uint8_t[::1] invert):
+    """
+    points_in_ellipses(x, y, cx, cy, cos_theta, sin_theta, inv_w2, inv_h2,
+                       invert)
+
+    Determine whether points are inside each of many ellipses.
+
+    This is equivalent to calling `points_in_ellipse` for each ellipse, but
+    loops over all the ellipses in compiled code.
+
+    Parameters
+    ----------
+    x, y : `~numpy.ndarray`
+        1-d contiguous arrays of the coordinates of the points.
+    cx, cy : `~numpy.ndarray`
+        1-d contiguous arrays of the centers of the ellipses.
+    cos_theta, sin_theta : `~numpy.ndarray`
+        1-d contiguous arrays of the cosine and sine of the rotation angles
+        of the ellipses.
+    inv_w2, inv_h2 : `~numpy.ndarray`
+        1-d contiguous arrays of the inverse squares of the semi-axes of the
+        ellipses.
+    invert : `~numpy.ndarray`
+        1-d contiguous `~numpy.uint8` array. Where nonzero, return whether
+        the points are outside the corresponding ellipse instead.
+
+    Returns
+    -------
+    result : `~numpy.ndarray`
+        2-d boolean array with shape ``(len(cx), len(x))``.
+    """
+
+    cdef Py_ssize_t i, j, n, nell
+    cdef double dx, dy, x_tr, y_tr, rad
+    cdef double cxj, cyj, cj, sj, wj, hj
+
+    n = x.shape[0]
+    nell = cx.shape[0]
+
+    result = np.empty((nell, n), dtype=bool)
+    cdef np.uint8_t[:, ::1] res = result.view(np.uint8)
+
+    with nogil:
+        for j in range(nell):
+            cxj = cx[j]
+            cyj = cy[j]
+            cj = cos_theta[j]
+            sj = sin_theta[j]
+            wj = inv_w2[j]
+            hj = inv_h2[j]
+            for i in range(n):
+                dx = x[i] - cxj
+                dy = y[i] - cyj
+
+                # Transform into frame of rotated ellipse
+                x_tr = cj * dx + sj * dy
+                y_tr = sj * dx - cj * dy
+
+                rad = x_tr * x_tr * wj + y_tr * y_tr * hj
+                res[j, i] = (rad > 1.) if invert[j] else (rad <= 1.)
+
+    return result
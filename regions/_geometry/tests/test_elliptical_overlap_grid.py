@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import itertools
 
+import numpy as np
 from numpy.testing import assert_allclose
 import pytest
 
@@ -33,3 +34,43 @@ def test_elliptical_overlap_grid(grid_size, maj_size, min_size, angle,
                                 maj_size, min_size, angle, use_exact,
                                 subsample)
     assert_allclose(g.max(), 1.0)
+
+
+@pytest.mark.parametrize(('angle', 'use_exact', 'subsample'),
+                         [(angle, 1, 1) for angle in angles] +
+                         [(angle, 0, 10) for angle in angles])
+def test_elliptical_overlap_grid_area(angle, use_exact, subsample):
+    """
+    Test that the overlap grid sums to the area of the ellipse, including
+    pixels that are fully inside or outside the ellipse.
+    """
+
+    g = elliptical_overlap_grid(-10.0, 10.0, -10.0, 10.0, 20, 20,
+                                7.0, 3.0, angle, use_exact, subsample)
+    assert_allclose(g.sum(), np.pi * 7.0 * 3.0, rtol=2e-2)
+    assert_allclose(g[0, 0], 0.0)
+    assert_allclose(g[10, 10], 1.0)
+
+
+@pytest.mark.parametrize(('angle', 'subsample'),
+                         list(itertools.product(angles, [1, 4, 7])))
+def test_elliptical_overlap_grid_subpixels(angle, subsample):
+    """
+    Test the subpixel sampling against a direct evaluation at the subpixel
+    centers.
+    """
+
+    rx, ry = 6.3, 2.7
+    g = elliptical_overlap_grid(-8.0, 8.0, -8.0, 8.0, 16, 16,
+                                rx, ry, angle, 0, subsample)
+
+    n = 16 * subsample
+    y, x = np.mgrid[0:n, 0:n]
+    x = -8.0 + (x + 0.5) / subsample
+    y = -8.0 + (y + 0.5) / subsample
+    x_tr = x * np.cos(angle) + y * np.sin(angle)
+    y_tr = y * np.cos(angle) - x * np.sin(angle)
+    inside = (x_tr / rx) ** 2 + (y_tr / ry) ** 2 < 1
+    expected = inside.reshape(16, subsample, 16, subsample).mean(axis=(1, 3))
+
+    assert_allclose(g, expected)
@@ -0,0 +1,46 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+from numpy.testing import assert_allclose
+import pytest
+
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from astropy.tests.helper import assert_quantity_allclose
+from astropy.wcs.utils import pixel_to_skycoord
+
+from ...core import PixCoord
+from ...tests.helpers import make_simple_wcs
+from ..wcs_helpers import (pixel_to_skycoord_scale_angle,
+                           skycoord_to_pixel_scale_angle)
+
+
+@pytest.mark.parametrize('center', [(2, 3), (359.99, 60), (200, -89)])
+@pytest.mark.parametrize('pixcoord', [PixCoord(3, 4), PixCoord(70.3, -20)])
+def test_pixel_to_skycoord_scale_angle(center, pixcoord):
+    wcs = make_simple_wcs(SkyCoord(*center, unit='deg'), 0.1 * u.deg, 20)
+
+    skycoord, scale, angle = pixel_to_skycoord_scale_angle(pixcoord, wcs)
+
+    expected = pixel_to_skycoord(pixcoord.x, pixcoord.y, wcs)
+    assert_quantity_allclose(skycoord.separation(expected), 0 * u.deg,
+                             atol=1e-10 * u.deg)
+
+    _, expected_scale, expected_angle = skycoord_to_pixel_scale_angle(
+        expected, wcs, small_offset=0.01 * u.arcsec)
+    assert_allclose(scale, expected_scale, rtol=1e-6)
+    assert_quantity_allclose(angle, expected_angle, atol=1e-5 * u.deg)
+
+
+def test_pixel_to_skycoord_scale_angle_array():
+    wcs = make_simple_wcs(SkyCoord(2, 3, unit='deg'), 0.1 * u.deg, 20)
+    pixcoord = PixCoord([3, 70.3, 10], [4, -20, 10])
+
+    skycoord, scale, angle = pixel_to_skycoord_scale_angle(pixcoord, wcs)
+    assert skycoord.shape == (3,)
+    assert scale.shape == (3,)
+    assert angle.shape == (3,)
+
+    for i in range(3):
+        expected = pixel_to_skycoord_scale_angle(PixCoord(pixcoord.x[i], pixcoord.y[i]), wcs)
+        assert_allclose(skycoord[i].ra.deg, expected[0].ra.deg)
+        assert_allclose(scale[i], expected[1])
+        assert_quantity_allclose(angle[i], expected[2])
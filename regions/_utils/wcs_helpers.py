@@ -3,7 +3,7 @@
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import UnitSphericalRepresentation
-from astropy.wcs.utils import skycoord_to_pixel
+from astropy.wcs.utils import skycoord_to_pixel, pixel_to_skycoord
 from ..core.pixcoord import PixCoord
 
 skycoord_to_pixel_mode = 'all'
@@ -68,6 +68,66 @@ def skycoord_to_pixel_scale_angle(skycoord, wcs, small_offset=1 * u.arcsec):
     return pixcoord, scale, angle
 
 
+def pixel_to_skycoord_scale_angle(pixcoord, wcs, small_offset=1.e-3):
+    """
+    Convert pixel coordinates into a SkyCoord, and find the pixel scale and
+    position angle at each location.
+
+    This is the counterpart of `skycoord_to_pixel_scale_angle` for pixel
+    positions. The position and four positions offset on either side of it
+    along the pixel axes are transformed in a single WCS call, and the scale
+    and angle are found from the resulting local Jacobian of the
+    transformation.
+
+    Parameters
+    ----------
+    pixcoord : `~regions.PixCoord`
+        Pixel coordinates
+    wcs : `~astropy.wcs.WCS`
+        The WCS transformation to use
+    small_offset : float
+        A small offset in pixels to use to compute the scale and angle
+
+    Returns
+    -------
+    skycoord : `~astropy.coordinates.SkyCoord`
+        Sky coordinates
+    scale : float or `~numpy.ndarray`
+        The pixel scale at each location, in pixels/degree
+    angle : `~astropy.units.Quantity`
+        The position angle of the celestial coordinate system in pixel space.
+    """
+
+    x = np.add.outer([0., small_offset, 0., -small_offset, 0.], pixcoord.x)
+    y = np.add.outer([0., 0., small_offset, 0., -small_offset], pixcoord.y)
+    coords = pixel_to_skycoord(x, y, wcs, mode=skycoord_to_pixel_mode)
+    skycoord = coords[0]
+
+    r = coords.represent_as('unitspherical')
+    lon = r.lon.degree
+    lat = r.lat.degree
+
+    # Local Jacobian of the transformation, in degrees per pixel, using
+    # central differences and offsets in longitude measured along the sky
+    dlon = (lon[1:3] - lon[3:5] + 180.) % 360. - 180.
+    dlon *= np.cos(np.radians(lat[0])) / (2 * small_offset)
+    dlat = (lat[1:3] - lat[3:5]) / (2 * small_offset)
+
+    # Invert the Jacobian to find the vector in pixel space that points
+    # towards increasing latitude, with a length of one degree
+    det = dlon[0] * dlat[1] - dlon[1] * dlat[0]
+    dx = -dlon[1] / det
+    dy = dlon[0] / det
+
+    # Find the length of the vector
+    scale = np.hypot(dx, dy)
+
+    # Find the position angle
+    angle = np.arctan2(dy, dx) * u.radian
+
+    return skycoord, scale, angle
+
+
 def assert_angle_or_pixel(name, q):
     """
     Check that ``q`` is either an angular or a pixel `~astropy.units.Quantity`.
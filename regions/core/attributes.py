@@ -1,9 +1,11 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 
 import abc
+import math
 
 from astropy.coordinates import SkyCoord
 from astropy.units import Quantity
+import astropy.units as u
 
 import numpy as np
 
@@ -111,6 +113,28 @@ class QuantityLength(RegionAttr):
             raise ValueError(f'The {self.name} must be a scalar astropy Quantity object')
 
 
+class RotationAngle(QuantityLength):
+    """
+    Descriptor class for the rotation angle of `~regions.PixelRegion`
+    which takes a scalar `~astropy.units.Quantity` object.
+
+    When the angle is set, its value in radians and its cosine and sine
+    are cached on the instance as ``_angle_rad``, ``_cos_angle`` and
+    ``_sin_angle``. A copy of the angle is stored, so that in-place
+    changes to the object that was passed in do not leave these cached
+    values out of date.
+    """
+
+    def __set__(self, instance, value):
+        self._validate(value)
+        value = value.copy()
+        instance.__dict__[self.name] = value
+        theta = float(value.to_value(u.rad))
+        instance.__dict__['_angle_rad'] = theta
+        instance.__dict__['_cos_angle'] = math.cos(theta)
+        instance.__dict__['_sin_angle'] = math.sin(theta)
+
+
 class CompoundRegionPix(RegionAttr):
     """
     Descriptor class for `~regions.CompoundPixelRegion` which takes a
@@ -2,7 +2,6 @@
 import operator
 import abc
 from astropy import units as u
-from astropy.wcs.utils import pixel_to_skycoord
 
 from regions import CompoundPixelRegion
 from regions import RegionMeta
@@ -10,7 +9,8 @@ from regions import RegionVisual
 from regions.core.attributes import QuantityLength
 from regions.core.attributes import ScalarPix, ScalarLength
 from regions.core.attributes import ScalarSky
-from .._utils.wcs_helpers import skycoord_to_pixel_scale_angle
+from .._utils.wcs_helpers import (pixel_to_skycoord_scale_angle,
+                                  skycoord_to_pixel_scale_angle)
 from ..core import PixelRegion, SkyRegion, PixCoord
 from ..shapes.circle import CirclePixelRegion
 from ..shapes.ellipse import EllipsePixelRegion, EllipseSkyRegion
@@ -140,8 +140,7 @@ class CircleAnnulusPixelRegion(AnnulusPixelRegion):
         return self._component_class(self.center, self.outer_radius, self.meta, self.visual)
 
     def to_sky(self, wcs):
-        center = pixel_to_skycoord(self.center.x, self.center.y, wcs)
-        _, scale, _ = skycoord_to_pixel_scale_angle(center, wcs)
+        center, scale, _ = pixel_to_skycoord_scale_angle(self.center, wcs)
         inner_radius = self.inner_radius / scale * u.deg
         outer_radius = self.outer_radius / scale * u.deg
         return CircleAnnulusSkyRegion(
@@ -252,8 +251,7 @@ class AsymmetricAnnulusPixelRegion(AnnulusPixelRegion):
         )
 
     def to_sky_args(self, wcs):
-        center = pixel_to_skycoord(self.center.x, self.center.y, wcs)
-        _, scale, north_angle = skycoord_to_pixel_scale_angle(center, wcs)
+        center, scale, north_angle = pixel_to_skycoord_scale_angle(self.center, wcs)
 
         inner_width = self.inner_width / scale * u.deg
         inner_height = self.inner_height / scale * u.deg
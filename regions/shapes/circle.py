@@ -3,10 +3,10 @@ import numpy as np
 import math
 
 from astropy.coordinates import Angle
-from astropy.wcs.utils import pixel_to_skycoord
 
 from ..core import PixCoord, PixelRegion, SkyRegion, RegionMask, BoundingBox
-from .._utils.wcs_helpers import skycoord_to_pixel_scale_angle
+from .._utils.wcs_helpers import (skycoord_to_pixel_scale_angle,
+                                  pixel_to_skycoord_scale_angle)
 from .._geometry import circular_overlap_grid
 from ..core.attributes import (ScalarSky, ScalarPix, QuantityLength,
                                ScalarLength, RegionVisual, RegionMeta)
@@ -76,9 +76,7 @@ class CirclePixelRegion(PixelRegion):
             return np.logical_not(in_circle)
 
     def to_sky(self, wcs):
-        # TODO: write a pixel_to_skycoord_scale_angle
-        center = pixel_to_skycoord(self.center.x, self.center.y, wcs)
-        _, scale, _ = skycoord_to_pixel_scale_angle(center, wcs)
+        center, scale, _ = pixel_to_skycoord_scale_angle(self.center, wcs)
         radius = Angle(self.radius / scale, 'deg')
         return CircleSkyRegion(center, radius, self.meta, self.visual)
 
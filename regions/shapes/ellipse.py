@@ -4,16 +4,20 @@ import math
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import Angle
-from astropy.wcs.utils import pixel_to_skycoord
 
 from ..core import PixCoord, PixelRegion, SkyRegion, RegionMask, BoundingBox
 from .._geometry import elliptical_overlap_grid
-from .._utils.wcs_helpers import skycoord_to_pixel_scale_angle
+from .._geometry.pnellipse import points_in_ellipse, points_in_ellipses
+from .._utils.wcs_helpers import (skycoord_to_pixel_scale_angle,
+                                  pixel_to_skycoord_scale_angle)
 from ..core.attributes import (ScalarPix, ScalarLength, QuantityLength,
-                               ScalarSky, RegionMeta, RegionVisual)
+                               RotationAngle, ScalarSky, RegionMeta,
+                               RegionVisual)
+from .polygon import PolygonPixelRegion
 
 
-__all__ = ['EllipsePixelRegion', 'EllipseSkyRegion']
+__all__ = ['EllipsePixelRegion', 'EllipseSkyRegion', 'ellipse_contains_many',
+           'ellipse_to_sky_many']
 
 
 class EllipsePixelRegion(PixelRegion):
@@ -65,7 +69,7 @@ class EllipsePixelRegion(PixelRegion):
     center = ScalarPix('center')
     width = ScalarLength('width')
     height = ScalarLength('height')
-    angle = QuantityLength('angle')
+    angle = RotationAngle('angle')
 
     def __init__(self, center, width, height, angle=0. * u.deg, meta=None,
                  visual=None):
@@ -83,21 +87,89 @@ class EllipsePixelRegion(PixelRegion):
 
     def contains(self, pixcoord):
         pixcoord = PixCoord._validate(pixcoord, name='pixcoord')
-        cos_angle = np.cos(self.angle)
-        sin_angle = np.sin(self.angle)
+        include = self.meta.get('include', True)
+        if self.width == 0 or self.height == 0:
+            # A degenerate ellipse does not contain any points
+            if pixcoord.isscalar:
+                return not include
+            return np.full(np.shape(pixcoord.x), not include)
+
+        # Work on plain floats rather than Quantity objects to avoid the
+        # unit-handling overhead, which dominates for small inputs
+        cos_angle = self._cos_angle
+        sin_angle = self._sin_angle
+        inv_w2 = 4. / self.width ** 2
+        inv_h2 = 4. / self.height ** 2
+
+        if not pixcoord.isscalar:
+            # Evaluate arrays in a single pass in compiled code, which
+            # avoids creating temporary arrays
+            x = np.ascontiguousarray(pixcoord.x, dtype=float)
+            y = np.ascontiguousarray(pixcoord.y, dtype=float)
+            in_ell = points_in_ellipse(x.ravel(), y.ravel(),
+                                       self.center.x, self.center.y,
+                                       cos_angle, sin_angle, inv_w2, inv_h2,
+                                       not include)
+            return in_ell.reshape(x.shape)
+
         dx = pixcoord.x - self.center.x
         dy = pixcoord.y - self.center.y
-        in_ell = ((2 * (cos_angle * dx + sin_angle * dy) / self.width) ** 2 +
-                  (2 * (sin_angle * dx - cos_angle * dy) / self.height) ** 2 <= 1.)
-        if self.meta.get('include', True):
-            return in_ell
+        if sin_angle == 0.:
+            # The ellipse axes are aligned with the pixel axes (a common
+            # case), so no rotation is needed
+            rad = dx * dx * inv_w2 + dy * dy * inv_h2
+        else:
+            u_ell = cos_angle * dx + sin_angle * dy
+            v_ell = sin_angle * dx - cos_angle * dy
+            rad = u_ell * u_ell * inv_w2 + v_ell * v_ell * inv_h2
+        # For excluded regions, invert the comparison rather than the result
+        if include:
+            return rad <= 1.
         else:
-            return np.logical_not(in_ell)
+            return rad > 1.
+
+    def prepare(self):
+        """
+        Prepare a fast containment test for repeated queries.
+
+        The parameters of the ellipse are captured when this method is
+        called, so the returned function does not reflect later changes to
+        the region.
+
+        Returns
+        -------
+        contains : function
+            A function ``contains(x, y)`` that takes the pixel coordinates
+            as floats or `~numpy.ndarray` objects and returns the same as
+            ``region.contains(PixCoord(x, y))``.
+        """
+        include = self.meta.get('include', True)
+        if self.width == 0 or self.height == 0:
+            # A degenerate ellipse does not contain any points
+            def contains(x, y):
+                return np.full(np.broadcast(x, y).shape, not include)[()]
+
+            return contains
+
+        cx = self.center.x
+        cy = self.center.y
+        cos_angle = self._cos_angle
+        sin_angle = self._sin_angle
+        inv_w2 = 4. / self.width ** 2
+        inv_h2 = 4. / self.height ** 2
+
+        def contains(x, y):
+            dx = x - cx
+            dy = y - cy
+            u_ell = cos_angle * dx + sin_angle * dy
+            v_ell = sin_angle * dx - cos_angle * dy
+            rad = u_ell * u_ell * inv_w2 + v_ell * v_ell * inv_h2
+            return rad <= 1. if include else rad > 1.
+
+        return contains
 
     def to_sky(self, wcs):
-        # TODO: write a pixel_to_skycoord_scale_angle
-        center = pixel_to_skycoord(self.center.x, self.center.y, wcs)
-        _, scale, north_angle = skycoord_to_pixel_scale_angle(center, wcs)
+        center, scale, north_angle = pixel_to_skycoord_scale_angle(self.center, wcs)
         height = Angle(self.height / scale, 'deg')
         width = Angle(self.width / scale, 'deg')
         return EllipseSkyRegion(center, width, height,
@@ -111,40 +183,57 @@ class EllipsePixelRegion(PixelRegion):
         exact elliptical region.
         """
 
-        # We use the solution described in http://stackoverflow.com/a/88020
-        # which is to use the parametric equation of an ellipse and to find
-        # when dx/dt or dy/dt=0.
-
-        cos_angle = np.cos(self.angle)
-        sin_angle = np.sin(self.angle)
-        tan_angle = np.tan(self.angle)
-
-        t1 = np.arctan(-self.height * tan_angle / self.width)
-        t2 = t1 + np.pi * u.rad
+        # The half-extents of a rotated ellipse along x and y have a closed
+        # form (obtained from the parametric equation of the ellipse by
+        # finding where dx/dt and dy/dt vanish), which avoids the tan
+        # singularity at angle = 90 deg.
+        cos_angle = self._cos_angle
+        sin_angle = self._sin_angle
+        half_width = 0.5 * self.width
+        half_height = 0.5 * self.height
 
-        dx1 = 0.5 * self.width * cos_angle * np.cos(t1) - 0.5 * self.height * sin_angle * np.sin(t1)
-        dx2 = 0.5 * self.width * cos_angle * np.cos(t2) - 0.5 * self.height * sin_angle * np.sin(t2)
+        dx = math.hypot(half_width * cos_angle, half_height * sin_angle)
+        dy = math.hypot(half_width * sin_angle, half_height * cos_angle)
 
-        if dx1 > dx2:
-            dx1, dx2 = dx2, dx1
+        xmin = self.center.x - dx
+        xmax = self.center.x + dx
+        ymin = self.center.y - dy
+        ymax = self.center.y + dy
 
-        t1 = np.arctan(self.height / tan_angle / self.width)
-        t2 = t1 + np.pi * u.rad
-
-        dy1 = 0.5 * self.height * cos_angle * np.sin(t1) + 0.5 * self.width * sin_angle * np.cos(t1)
-        dy2 = 0.5 * self.height * cos_angle * np.sin(t2) + 0.5 * self.width * sin_angle * np.cos(t2)
-
-        if dy1 > dy2:
-            dy1, dy2 = dy2, dy1
+        return BoundingBox.from_float(xmin, xmax, ymin, ymax)
 
-        xmin = self.center.x + dx1
-        xmax = self.center.x + dx2
-        ymin = self.center.y + dy1
-        ymax = self.center.y + dy2
+    def to_mask(self, mode='center', subpixels=5, dtype=np.float64):
+        """
+        Returns a mask for the aperture.
 
-        return BoundingBox.from_float(xmin, xmax, ymin, ymax)
+        Parameters
+        ----------
+        mode : { 'center' | 'exact' | 'subpixels'}, optional
+            The following modes are available:
+                * ``'center'``: returns 1 for pixels where the center is in
+                  the region, and 0 otherwise.
+                * ``'exact'``: returns a value between 0 and 1 giving the
+                  fractional level of overlap of the pixel with the region.
+                * ``'subpixels'``: A pixel is divided into subpixels and
+                  the center of each subpixel is tested (a subpixel is
+                  either completely in or out of the region).  Returns a
+                  value between 0 and 1 giving the fractional level of
+                  overlap of the subpixels with the region.  With
+                  ``subpixels`` set to 1, this method is equivalent to
+                  ``'center'``.
+        subpixels : int, optional
+            For the ``'subpixel'`` mode, resample pixels by this factor
+            in each dimension. That is, each pixel is divided into
+            ``subpixels ** 2`` subpixels.
+        dtype : {`numpy.float64`, `numpy.float32`}, optional
+            The data type of the mask. Single precision halves the memory
+            used by the mask, which can be useful for large regions.
 
-    def to_mask(self, mode='center', subpixels=5):
+        Returns
+        -------
+        mask : `~regions.Mask`
+            A region mask object.
+        """
 
         # NOTE: assumes this class represents a single circle
 
@@ -172,8 +261,8 @@ class EllipsePixelRegion(PixelRegion):
         fraction = elliptical_overlap_grid(
             xmin, xmax, ymin, ymax, nx, ny,
             0.5 * self.width, 0.5 * self.height,
-            self.angle.to(u.rad).value,
-            use_exact, subpixels,
+            self._angle_rad,
+            use_exact, subpixels, dtype=dtype,
         )
 
         return RegionMask(fraction, bbox=bbox)
@@ -201,11 +290,14 @@ class EllipsePixelRegion(PixelRegion):
         width = self.width
         height = self.height
         # From the docstring: MPL expects "rotation in degrees (anti-clockwise)"
-        angle = self.angle.to('deg').value
+        angle = math.degrees(self._angle_rad)
 
         mpl_params = self.mpl_properties_default('patch')
         mpl_params.update(kwargs)
 
+        # NOTE: there is no need to cache a Bezier path for the outline here:
+        # Matplotlib draws Ellipse patches from its shared unit circle path
+        # (made of eight cubic Bezier arcs) and an affine transform.
         return Ellipse(xy=xy, width=width, height=height, angle=angle,
                        **mpl_params)
 
@@ -259,7 +351,7 @@ class EllipsePixelRegion(PixelRegion):
         if hasattr(self, '_mpl_selector'):
             raise Exception("Cannot attach more than one selector to a region.")
 
-        if self.angle.value != 0:
+        if self._angle_rad != 0:
             raise NotImplementedError("Cannot create matplotlib selector for rotated ellipse.")
 
         if sync:
@@ -285,6 +377,42 @@ class EllipsePixelRegion(PixelRegion):
 
         return self._mpl_selector
 
+    def to_polygon(self, nsegs=None):
+        """
+        Return a polygon approximating the outline of this ellipse.
+
+        Parameters
+        ----------
+        nsegs : int, optional
+            The number of vertices of the polygon. By default, this is
+            chosen so that the edges are about one pixel long.
+
+        Returns
+        -------
+        polygon : `~regions.PolygonPixelRegion`
+            Polygon with vertices on the ellipse.
+        """
+        half_width = 0.5 * self.width
+        half_height = 0.5 * self.height
+
+        if nsegs is None:
+            # Ramanujan's approximation of the perimeter of the ellipse
+            a, b = half_width, half_height
+            perimeter = math.pi * (3 * (a + b) -
+                                   math.sqrt((3 * a + b) * (a + 3 * b)))
+            nsegs = max(8, int(math.ceil(perimeter)))
+
+        # Parametric outline of the ellipse, which is then rotated and
+        # translated into place
+        t = np.linspace(0., 2. * np.pi, nsegs, endpoint=False)
+        u_ell = half_width * np.cos(t)
+        v_ell = half_height * np.sin(t)
+        x = self.center.x + self._cos_angle * u_ell - self._sin_angle * v_ell
+        y = self.center.y + self._sin_angle * u_ell + self._cos_angle * v_ell
+
+        return PolygonPixelRegion(vertices=PixCoord(x=x, y=y), meta=self.meta,
+                                  visual=self.visual)
+
     def rotate(self, center, angle):
         """Make a rotated region.
 
@@ -351,3 +479,106 @@ class EllipseSkyRegion(SkyRegion):
         return EllipsePixelRegion(center, width, height,
                                   angle=self.angle + (north_angle - 90 * u.deg),
                                   meta=self.meta, visual=self.visual)
+
+
+def _validate_ellipses(regions):
+    regions = list(regions)
+    for reg in regions:
+        if not isinstance(reg, EllipsePixelRegion):
+            raise TypeError('regions must be EllipsePixelRegion objects, '
+                            f'got {type(reg).__name__}')
+    return regions
+
+
+def ellipse_contains_many(regions, pixcoord):
+    """
+    Test which of the given pixel coordinates fall inside each of many
+    ellipses.
+
+    This is equivalent to calling `EllipsePixelRegion.contains` for each
+    region in turn, but loops over all the regions in compiled code, which
+    is faster when testing the same points against many regions.
+
+    Parameters
+    ----------
+    regions : iterable of `EllipsePixelRegion`
+        The ellipses to test against.
+    pixcoord : `~regions.PixCoord`
+        The pixel coordinates to test.
+
+    Returns
+    -------
+    contains : `~numpy.ndarray`
+        Boolean array with shape ``(len(regions),) + pixcoord.x.shape``.
+    """
+    pixcoord = PixCoord._validate(pixcoord, name='pixcoord')
+    regions = _validate_ellipses(regions)
+    nreg = len(regions)
+
+    cx = np.fromiter((reg.center.x for reg in regions), float, nreg)
+    cy = np.fromiter((reg.center.y for reg in regions), float, nreg)
+    width = np.fromiter((reg.width for reg in regions), float, nreg)
+    height = np.fromiter((reg.height for reg in regions), float, nreg)
+    cos_angle = np.fromiter((reg._cos_angle for reg in regions), float, nreg)
+    sin_angle = np.fromiter((reg._sin_angle for reg in regions), float, nreg)
+    invert = np.fromiter((not reg.meta.get('include', True)
+                          for reg in regions), bool, nreg)
+
+    # Degenerate ellipses do not contain any points, so their rows are
+    # filled in separately below; use a dummy size to avoid dividing by zero
+    degenerate = (width == 0) | (height == 0)
+    width[degenerate] = 1.
+    height[degenerate] = 1.
+
+    shape = np.shape(pixcoord.x)
+    x = np.ascontiguousarray(pixcoord.x, dtype=float).ravel()
+    y = np.ascontiguousarray(pixcoord.y, dtype=float).ravel()
+
+    result = points_in_ellipses(x, y, cx, cy, cos_angle, sin_angle,
+                                4. / width ** 2, 4. / height ** 2,
+                                invert.view(np.uint8))
+    result[degenerate] = invert[degenerate, None]
+
+    return result.reshape((nreg,) + shape)
+
+
+def ellipse_to_sky_many(regions, wcs):
+    """
+    Convert many ellipses from pixel to sky coordinates.
+
+    This is equivalent to calling `EllipsePixelRegion.to_sky` for each
+    region in turn, but transforms the centers of all regions with a single
+    WCS call.
+
+    Parameters
+    ----------
+    regions : iterable of `EllipsePixelRegion`
+        The ellipses to convert.
+    wcs : `~astropy.wcs.WCS`
+        The WCS transformation to use.
+
+    Returns
+    -------
+    regions : list of `EllipseSkyRegion`
+        The ellipses in sky coordinates.
+    """
+    regions = _validate_ellipses(regions)
+    if not regions:
+        return []
+
+    nreg = len(regions)
+    cx = np.fromiter((reg.center.x for reg in regions), float, nreg)
+    cy = np.fromiter((reg.center.y for reg in regions), float, nreg)
+    width = np.fromiter((reg.width for reg in regions), float, nreg)
+    height = np.fromiter((reg.height for reg in regions), float, nreg)
+
+    centers, scale, north_angle = pixel_to_skycoord_scale_angle(
+        PixCoord(cx, cy), wcs)
+    width = Angle(width / scale, 'deg')
+    height = Angle(height / scale, 'deg')
+    north_angle = north_angle - 90 * u.deg
+
+    return [EllipseSkyRegion(centers[i], width[i], height[i],
+                             angle=reg.angle - north_angle[i],
+                             meta=reg.meta, visual=reg.visual)
+            for i, reg in enumerate(regions)]
@@ -1,14 +1,17 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import math
+
 import numpy as np
 from astropy import units as u
 
 from astropy.coordinates import Angle
-from astropy.wcs.utils import pixel_to_skycoord
 
 from ..core import PixCoord, PixelRegion, SkyRegion, RegionMask, BoundingBox
 from .._geometry import rectangular_overlap_grid
-from .._utils.wcs_helpers import skycoord_to_pixel_scale_angle
-from ..core.attributes import ScalarPix, ScalarLength, QuantityLength, ScalarSky
+from .._utils.wcs_helpers import (skycoord_to_pixel_scale_angle,
+                                  pixel_to_skycoord_scale_angle)
+from ..core.attributes import (ScalarPix, ScalarLength, QuantityLength,
+                               RotationAngle, ScalarSky)
 from .polygon import PolygonPixelRegion
 
 __all__ = ['RectanglePixelRegion', 'RectangleSkyRegion']
@@ -65,7 +68,7 @@ class RectanglePixelRegion(PixelRegion):
     center = ScalarPix('center')
     width = ScalarLength('width')
     height = ScalarLength('height')
-    angle = QuantityLength('angle')
+    angle = RotationAngle('angle')
 
     def __init__(self, center, width, height, angle=0 * u.deg, meta=None, visual=None):
         self.center = center
@@ -94,9 +97,7 @@ class RectanglePixelRegion(PixelRegion):
             return np.logical_not(in_rect)
 
     def to_sky(self, wcs):
-        # TODO: write a pixel_to_skycoord_scale_angle
-        center = pixel_to_skycoord(self.center.x, self.center.y, wcs)
-        _, scale, north_angle = skycoord_to_pixel_scale_angle(center, wcs)
+        center, scale, north_angle = pixel_to_skycoord_scale_angle(self.center, wcs)
         width = Angle(self.width / scale, 'deg')
         height = Angle(self.height / scale, 'deg')
         return RectangleSkyRegion(center, width, height,
@@ -112,14 +113,12 @@ class RectanglePixelRegion(PixelRegion):
 
         w2 = self.width / 2.
         h2 = self.height / 2.
-        cos_angle = np.cos(self.angle)  # self.angle is a Quantity
-        sin_angle = np.sin(self.angle)  # self.angle is a Quantity
-        dx1 = abs(w2 * cos_angle - h2 * sin_angle)
-        dy1 = abs(w2 * sin_angle + h2 * cos_angle)
-        dx2 = abs(w2 * cos_angle + h2 * sin_angle)
-        dy2 = abs(w2 * sin_angle - h2 * cos_angle)
-        dx = max(dx1, dx2)
-        dy = max(dy1, dy2)
+        cos_angle = self._cos_angle
+        sin_angle = self._sin_angle
+        # The half-extents are set by the corners furthest from the center
+        # along each axis, i.e. max(|a - b|, |a + b|) = |a| + |b|
+        dx = abs(w2 * cos_angle) + abs(h2 * sin_angle)
+        dy = abs(w2 * sin_angle) + abs(h2 * cos_angle)
 
         xmin = self.center.x - dx
         xmax = self.center.x + dx
@@ -156,7 +155,7 @@ class RectanglePixelRegion(PixelRegion):
         fraction = rectangular_overlap_grid(
             xmin, xmax, ymin, ymax, nx, ny,
             self.width, self.height,
-            self.angle.to(u.rad).value,
+            self._angle_rad,
             use_exact, subpixels,
         )
 
@@ -185,7 +184,7 @@ class RectanglePixelRegion(PixelRegion):
         width = self.width
         height = self.height
         # From the docstring: MPL expects "rotation in degrees (anti-clockwise)"
-        angle = self.angle.to('deg').value
+        angle = math.degrees(self._angle_rad)
 
         mpl_params = self.mpl_properties_default('patch')
         mpl_params.update(kwargs)
@@ -243,7 +242,7 @@ class RectanglePixelRegion(PixelRegion):
         if hasattr(self, '_mpl_selector'):
             raise Exception("Cannot attach more than one selector to a region.")
 
-        if self.angle.value != 0:
+        if self._angle_rad != 0:
             raise NotImplementedError("Cannot create matplotlib selector for rotated rectangle.")
 
         if sync:
@@ -305,8 +304,8 @@ class RectanglePixelRegion(PixelRegion):
         """
         hw = self.width / 2.
         hh = self.height / 2.
-        sint = np.sin(self.angle)
-        cost = np.cos(self.angle)
+        sint = self._sin_angle
+        cost = self._cos_angle
         dx = (hh * sint) - (hw * cost)
         dy = -(hh * cost) - (hw * sint)
         x = self.center.x + dx
@@ -12,7 +12,9 @@ from astropy.wcs import WCS
 
 from ...core import PixCoord
 from ...tests.helpers import make_simple_wcs
-from ..ellipse import EllipsePixelRegion, EllipseSkyRegion
+from ..ellipse import (EllipsePixelRegion, EllipseSkyRegion,
+                       ellipse_contains_many, ellipse_to_sky_many)
+from ..rectangle import RectanglePixelRegion
 from .utils import HAS_MATPLOTLIB  # noqa
 from .test_common import BaseTestPixelRegion, BaseTestSkyRegion
 
@@ -75,6 +77,80 @@ class TestEllipsePixelRegion(BaseTestPixelRegion):
                                  angle=90. * u.deg)
         assert reg.bounding_box.shape == (a, b)
 
+    def test_angle_update(self):
+        reg = EllipsePixelRegion(PixCoord(0, 0), width=7, height=3)
+        assert reg.contains(PixCoord(3, 0))
+        assert reg.bounding_box.shape == (3, 7)
+        reg.angle = 90 * u.deg
+        assert not reg.contains(PixCoord(3, 0))
+        assert reg.contains(PixCoord(0, 3))
+        assert reg.bounding_box.shape == (7, 3)
+
+    def test_angle_alias(self):
+        angle = 0 * u.deg
+        reg = EllipsePixelRegion(PixCoord(0, 0), width=7, height=3, angle=angle)
+        angle += 90 * u.deg
+        assert_quantity_allclose(reg.angle, 0 * u.deg)
+        assert reg.contains(PixCoord(3, 0))
+
+        # In-place updates must not change the shared default angle
+        reg = EllipsePixelRegion(PixCoord(0, 0), width=7, height=3)
+        reg.angle += 90 * u.deg
+        assert_quantity_allclose(reg.angle, 90 * u.deg)
+        assert reg.contains(PixCoord(0, 3))
+        reg = EllipsePixelRegion(PixCoord(0, 0), width=7, height=3)
+        assert_quantity_allclose(reg.angle, 0 * u.deg)
+        assert reg.contains(PixCoord(3, 0))
+        reg = RectanglePixelRegion(PixCoord(0, 0), width=7, height=3)
+        assert_quantity_allclose(reg.angle, 0 * u.deg)
+        assert reg.contains(PixCoord(3, 0))
+
+    def test_contains_exclude(self):
+        reg = self.reg.copy()
+        reg.meta['include'] = False
+        assert not reg.contains(PixCoord(*self.inside[0]))
+        assert reg.contains(PixCoord(*self.outside[0]))
+        pixcoord = PixCoord(*zip(*(self.inside + self.outside)))
+        assert_equal(reg.contains(pixcoord), [False, True])
+
+    def test_prepare(self):
+        contains = self.reg.prepare()
+        for pixcoord in (PixCoord(*self.inside[0]), PixCoord(*self.outside[0])):
+            assert contains(pixcoord.x, pixcoord.y) == self.reg.contains(pixcoord)
+
+        x, y = np.mgrid[-2:8:0.3, -1:9:0.3]
+        assert_equal(contains(x, y), self.reg.contains(PixCoord(x, y)))
+
+        reg = self.reg.copy()
+        reg.meta['include'] = False
+        assert_equal(reg.prepare()(x, y), reg.contains(PixCoord(x, y)))
+
+    @pytest.mark.parametrize('mode', ('center', 'exact', 'subpixels'))
+    def test_to_mask_float32(self, mode):
+        mask64 = self.reg.to_mask(mode=mode)
+        mask32 = self.reg.to_mask(mode=mode, dtype=np.float32)
+        assert mask32.data.dtype == np.float32
+        assert mask32.bbox == mask64.bbox
+        assert_allclose(mask32.data, mask64.data, rtol=1e-6)
+
+    def test_to_polygon(self):
+        polygon = self.reg.to_polygon()
+        assert len(polygon.vertices) == 12
+
+        polygon = self.reg.to_polygon(nsegs=200)
+        assert len(polygon.vertices) == 200
+        assert_allclose(polygon.area, self.reg.area, rtol=1e-3)
+
+        # The vertices should lie on the ellipse
+        contains = self.reg.prepare()
+        x, y = polygon.vertices.x, polygon.vertices.y
+        dx = x - self.reg.center.x
+        dy = y - self.reg.center.y
+        assert np.all(contains(self.reg.center.x + dx * (1 - 1e-9),
+                               self.reg.center.y + dy * (1 - 1e-9)))
+        assert not np.any(contains(self.reg.center.x + dx * (1 + 1e-9),
+                                   self.reg.center.y + dy * (1 + 1e-9)))
+
     def test_rotate(self):
         reg = self.reg.rotate(PixCoord(2, 3), 90 * u.deg)
         assert_allclose(reg.center.xy, (1, 4))
@@ -149,6 +225,82 @@ class TestEllipsePixelRegion(BaseTestPixelRegion):
             region.as_mpl_selector(ax)
 
 
+@pytest.mark.parametrize('include', (True, False))
+def test_contains_axis_aligned(include):
+    # Scalar inputs at an angle of exactly zero use the unrotated path
+    reg = EllipsePixelRegion(PixCoord(3, 4), width=4, height=3,
+                             meta={'include': include})
+    x = [4.9, 5.1, 3, 3, 4.5]
+    y = [4, 4, 5.4, 5.6, 5]
+    expected = np.array([True, False, True, False, False]) == include
+    actual = [reg.contains(PixCoord(xi, yi)) for xi, yi in zip(x, y)]
+    assert_equal(actual, expected)
+    assert_equal(reg.contains(PixCoord(x, y)), expected)
+
+
+@pytest.mark.parametrize(('width', 'height'), ((0, 2), (2, 0), (0, 0)))
+def test_contains_degenerate(width, height):
+    reg = EllipsePixelRegion(PixCoord(0, 0), width=width, height=height)
+    pixcoord = PixCoord([0., 1.], [0., 0.])
+    assert_equal(reg.contains(pixcoord), [False, False])
+    assert not reg.contains(PixCoord(0, 0))
+    assert_equal(reg.prepare()(pixcoord.x, pixcoord.y), [False, False])
+
+    reg.meta['include'] = False
+    assert_equal(reg.contains(pixcoord), [True, True])
+    assert reg.contains(PixCoord(0, 0))
+    assert_equal(reg.prepare()(pixcoord.x, pixcoord.y), [True, True])
+
+
+def test_ellipse_contains_many():
+    regions = [EllipsePixelRegion(PixCoord(3, 4), width=4, height=3, angle=5 * u.deg),
+               EllipsePixelRegion(PixCoord(10, 2), width=8, height=2, angle=60 * u.deg),
+               EllipsePixelRegion(PixCoord(0, 0), width=5, height=5),
+               EllipsePixelRegion(PixCoord(1, 2), width=0, height=5)]
+    regions[1].meta['include'] = False
+    x, y = np.mgrid[-5:15:0.7, -5:10:0.9]
+    pixcoord = PixCoord(x, y)
+
+    actual = ellipse_contains_many(regions, pixcoord)
+    assert actual.shape == (4,) + x.shape
+    for reg, result in zip(regions, actual):
+        assert_equal(result, reg.contains(pixcoord))
+
+    # Non-finite coordinates are never contained, even in excluded regions
+    pixcoord = PixCoord([np.nan, 10, 0], [0, 2, 0])
+    assert_equal(ellipse_contains_many(regions[1:2], pixcoord), [[False, False, True]])
+    for reg, result in zip(regions, ellipse_contains_many(regions, pixcoord)):
+        assert_equal(result, reg.contains(pixcoord))
+
+    assert ellipse_contains_many([], pixcoord).shape == (0, 3)
+
+    rect = RectanglePixelRegion(PixCoord(0, 0), width=4, height=4)
+    with pytest.raises(TypeError, match='RectanglePixelRegion'):
+        ellipse_contains_many(regions + [rect], pixcoord)
+
+
+def test_ellipse_to_sky_many(wcs):
+    regions = [EllipsePixelRegion(PixCoord(3, 4), width=4, height=3, angle=5 * u.deg),
+               EllipsePixelRegion(PixCoord(100, 20), width=8, height=2, angle=60 * u.deg),
+               EllipsePixelRegion(PixCoord(50.5, 80), width=5, height=5)]
+
+    actual = ellipse_to_sky_many(regions, wcs)
+    assert len(actual) == 3
+    for reg, result in zip(regions, actual):
+        expected = reg.to_sky(wcs)
+        assert_quantity_allclose(result.center.separation(expected.center), 0 * u.deg,
+                                 atol=1e-10 * u.deg)
+        assert_quantity_allclose(result.width, expected.width)
+        assert_quantity_allclose(result.height, expected.height)
+        assert_quantity_allclose(result.angle, expected.angle)
+
+    assert ellipse_to_sky_many([], wcs) == []
+
+    rect = RectanglePixelRegion(PixCoord(0, 0), width=4, height=4)
+    with pytest.raises(TypeError, match='RectanglePixelRegion'):
+        ellipse_to_sky_many(regions + [rect], wcs)
+
+
 class TestEllipseSkyRegion(BaseTestSkyRegion):
     reg = EllipseSkyRegion(
         center=SkyCoord(3, 4, unit='deg'),